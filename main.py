@@ -1,9 +1,9 @@
 # app.py
 import os
 import re
+import functools
 import time
 import math
-import html
 import json
 import queue
 import random
@@ -13,14 +13,54 @@ import feedparser
 import phonenumbers
 import threading
 import tldextract
+import numpy as np
 import pandas as pd
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from bs4 import BeautifulSoup
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dateutil import parser as dateparser
 
+# Optional: C-backed multi-pattern matcher; we fall back to a compiled
+# regex alternation (re builds a trie for fixed-string alternations).
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: lexbor-backed HTML parsing, much faster than BeautifulSoup for
+# bulk text extraction; bs4 remains the fallback.
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Optional: hyperscan scans the email+URL patterns in one pass; re fallback.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional: faster JSON decode for the HN/Reddit responses; stdlib fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: JIT the fused score kernel; the NumPy version is the fallback.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+def _json_loads(resp):
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
 APP_NAME = "Lead Radar Pro (Free Sources) — Outsourcing Clients & Developers"
 
 # ---------------------------
@@ -72,7 +112,17 @@ RSS_FEEDS = [
     "https://remoteok.com/remote-dev+contract-jobs.rss",
 ]
 
-REQUEST_HEADERS = {"User-Agent": "LeadRadarPro/1.0 (+https://example.com)"}
+REQUEST_HEADERS = {
+    "User-Agent": "LeadRadarPro/1.0 (+https://example.com)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Shared session: reuses TCP/TLS connections across all fetchers and scrapes
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                            max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION = requests.Session()
+_SESSION.mount("https://", _HTTP_ADAPTER)
+_SESSION.mount("http://", _HTTP_ADAPTER)
 
 CLIENT_HINTS = [
     "need developer",
@@ -106,6 +156,22 @@ TRIGGER_KEYWORDS = {
     "deadline": ["deadline", "urgent", "immediately", "asap", "deliver by", "time sensitive"],
 }
 
+INDUSTRY_PATTERNS = {
+    "Fintech": ["fintech","payments","banking","trading","ledger","crypto","defi"],
+    "Healthtech": ["health","med","clinic","ehr","wellness","fitness"],
+    "E-commerce": ["shopify","ecommerce","storefront","marketplace","checkout"],
+    "SaaS": ["saas","b2b","multi-tenant","subscription"],
+    "Edtech": ["education","learning","edtech","course","lms"],
+    "AI/ML": ["ai","ml","model","llm","computer vision","nlp"],
+    "Logistics": ["logistics","fleet","delivery","supply chain"],
+    "Real Estate": ["real estate","property","proptech"],
+    "Travel": ["travel","booking","itinerary"],
+    "Social": ["social","community","messaging","feed"],
+}
+
+_TRIGGER_WEIGHTS = {"funding": 1.0, "launch": 0.8, "hiring_freeze": 0.7, "scale_up": 0.6, "deadline": 0.5}
+_TRIGGER_ORDER = ["funding", "launch", "hiring_freeze", "scale_up", "deadline"]
+
 SKILL_LIB = [
     "python","django","flask","fastapi","pandas",
     "javascript","typescript","react","node","next.js","vue","angular","svelte",
@@ -117,8 +183,139 @@ SKILL_LIB = [
     "ai","ml","llm","nlp","computer vision","pytorch","tensorflow",
 ]
 
+# Loose words classify_post checks outside the hint lists
+_CLASSIFY_WORDS = ["hire", "developer", "available", "for hire"]
+
+# Quick precheck: a post can only classify if it contains at least one of
+# these leading tokens, so noise posts skip the full keyword pass entirely
+_TOKEN_RE = re.compile(r"[a-z0-9\[\]]+")
+_CLIENT_TOKEN_SET = frozenset(h.split()[0] for h in CLIENT_HINTS) | {"hire", "developer"}
+_CAND_TOKEN_SET = frozenset(h.split()[0] for h in CANDIDATE_HINTS) | {"available", "developer"}
+
+class _RegexKeywordScanner:
+    """Fallback scanner matching keyword_hits' automaton interface via one regex.
+
+    The lookahead wrapper makes matches overlap the way Aho-Corasick's do, and
+    a containment map restores shorter keywords shadowed by a longer
+    alternative at the same position (e.g. "react" inside "react native").
+    """
+    def __init__(self, tags_by_word):
+        words = sorted(tags_by_word, key=len, reverse=True)
+        self._tags = tags_by_word
+        self._contained = {w: [o for o in words if o != w and o in w] for w in words}
+        self._re = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+
+    def iter(self, text):
+        for m in self._re.finditer(text):
+            w = m.group(1)
+            yield m.end(), self._tags[w]
+            for o in self._contained[w]:
+                yield m.end(), self._tags[o]
+
+def _build_keyword_automaton(tagged_keywords):
+    """Compile (category, bucket, keyword) triples into one multi-pattern matcher.
+
+    A keyword may belong to several categories, so each word carries a tuple of tags.
+    """
+    tags_by_word = defaultdict(list)
+    for cat, bucket, kw in tagged_keywords:
+        w = kw.lower()
+        tags_by_word[w].append((cat, bucket, w))
+    if ahocorasick is None:
+        return _RegexKeywordScanner({w: tuple(tags) for w, tags in tags_by_word.items()})
+    ac = ahocorasick.Automaton()
+    for word, tags in tags_by_word.items():
+        ac.add_word(word, tuple(tags))
+    ac.make_automaton()
+    return ac
+
+def _base_tagged_keywords():
+    for bucket, kws in TRIGGER_KEYWORDS.items():
+        for k in kws:
+            yield ("trigger", bucket, k)
+    for k in CLIENT_HINTS:
+        yield ("client", None, k)
+    for k in CANDIDATE_HINTS:
+        yield ("cand", None, k)
+    for k in SKILL_LIB:
+        yield ("skill", None, k)
+    for industry, kws in INDUSTRY_PATTERNS.items():
+        for k in kws:
+            yield ("industry", industry, k)
+    for k in _CLASSIFY_WORDS:
+        yield ("word", None, k)
+
+_KEYWORD_AC = _build_keyword_automaton(_base_tagged_keywords())
+
+def keyword_hits(text_lower, automaton=_KEYWORD_AC):
+    """One linear scan; returns {category: {(bucket, keyword), ...}}."""
+    hits = defaultdict(set)
+    if text_lower:
+        for _, tags in automaton.iter(text_lower):
+            for cat, bucket, kw in tags:
+                hits[cat].add((bucket, kw))
+    return hits
+
 LOCK = threading.Lock()
 
+# Precompiled patterns (hot loops; avoids re-cache lookups per call)
+# Word-anchored with bounded repeats: caps worst-case backtracking on long UGC
+_EMAIL_PAT = r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){1,4}\b"
+_URL_PAT = r"https?://[^\s)]{1,2048}"
+_EMAIL_RE = re.compile(_EMAIL_PAT)
+_URL_RE = re.compile(_URL_PAT)
+_YOE_RE = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs|y)\b")
+_LOC_RE = re.compile(r"(remote|india|usa|europe|uk|canada|australia|singapore|germany|netherlands|uae|dubai)")
+_AVAIL_RE = re.compile(r"immediate|asap|available now")
+_PORTFOLIO_RE = re.compile(r"github\.com|gitlab\.com|behance\.net|dribbble\.com|codepen\.io|linkedin\.com|portfolio|notion\.site")
+
+# Regions for phone parsing, ordered by expected hit rate
+_REGIONS = ("US","IN","GB","CA","AU","SG","DE","NL","FR","ES","SE","NO","DK","IE","AE")
+
+# Bundled-snapshot PSL, no cache-dir I/O or list download on first use
+_TLDEXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+_HS_EMAIL, _HS_URL = 0, 1
+# Hyperscan is automata-based (no backtracking), so it keeps the simpler
+# unbounded forms; the bounded repeats above exceed its SOM pattern limits
+_HS_EMAIL_PAT = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
+_HS_URL_PAT = r"https?://[^\s)]+"
+_HS_DB = None
+if hyperscan is not None:
+    try:
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=[_HS_EMAIL_PAT.encode(), _HS_URL_PAT.encode()],
+            ids=[_HS_EMAIL, _HS_URL],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8] * 2,
+        )
+    except Exception:
+        _HS_DB = None
+
+def _hs_scan(text):
+    """One hyperscan pass over text; returns {pattern id: [matched strings]}.
+
+    Hyperscan reports every match, so nested hits (e.g. a shorter email inside
+    a longer one) are dropped by keeping only intervals not contained in a
+    wider match of the same pattern.
+    """
+    data = text.encode("utf-8", "ignore")
+    spans = defaultdict(list)
+
+    def on_match(pat_id, start, end, flags, ctx=None):
+        spans[pat_id].append((start, end))
+
+    _HS_DB.scan(data, match_event_handler=on_match)
+    out = defaultdict(list)
+    for pat_id, ivals in spans.items():
+        last_s, last_e = -1, -1
+        for s, e in sorted(ivals, key=lambda x: (x[0], -x[1])):
+            if s >= last_s and e <= last_e:
+                continue
+            last_s, last_e = s, e
+            out[pat_id].append(data[s:e].decode("utf-8", "ignore"))
+    return out
+
 # Optional paid enrichment (disabled by default; leave keys blank)
 APOLLO_API_KEY = os.getenv("APOLLO_API_KEY", "")
 LUSHA_API_KEY = os.getenv("LUSHA_API_KEY", "")
@@ -133,6 +330,15 @@ def within_30_days(dt):
 def parse_any_dt(s):
     if not s:
         return None
+    # Fast path: HN Algolia (and many feeds) emit canonical ISO 8601, which
+    # fromisoformat parses ~50x faster than dateutil's guessing parser
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    except (ValueError, TypeError):
+        pass
     try:
         return dateparser.parse(s).astimezone(timezone.utc)
     except Exception:
@@ -144,29 +350,77 @@ def parse_unix_ts(ts):
     except Exception:
         return None
 
-def score_recency(dt):
-    if not dt:
-        return 0.0
-    days = (NOW - dt).total_seconds() / 86400
-    return max(0.0, min(1.0, 1.0 - (days / MAX_DAYS)))
-
-def score_trigger(text):
-    if not text:
-        return 0.0
-    t = text.lower()
+def _score_kernel_np(created, points, comments, trig, access, now_ts):
+    rec = np.clip(1.0 - (now_ts - created) / (MAX_DAYS * 86400.0), 0.0, 1.0)
+    # Floor the log1p argument at 0 so heavily downvoted posts can't push
+    # it to -1 and emit -inf/NaN
+    eng = np.clip(np.log1p(np.maximum(points + 0.6 * comments, 0.0)) / 5.0, 0.0, 1.0)
+    score = 0.38 * trig + 0.30 * rec + 0.18 * eng + 0.14 * access
+    return score, rec, eng
+
+if njit is not None:
+    # Strings and regexes stay out of the JIT body on purpose; this is pure
+    # array math over the inputs _score_records collects.
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_kernel(created, points, comments, trig, access, now_ts):
+        n = created.shape[0]
+        score = np.empty(n)
+        rec = np.empty(n)
+        eng = np.empty(n)
+        for i in prange(n):
+            r = 1.0 - (now_ts - created[i]) / (MAX_DAYS * 86400.0)
+            if r < 0.0:
+                r = 0.0
+            elif r > 1.0:
+                r = 1.0
+            p = points[i] + 0.6 * comments[i]
+            if p < 0.0:
+                p = 0.0
+            e = np.log1p(p) / 5.0
+            if e < 0.0:
+                e = 0.0
+            elif e > 1.0:
+                e = 1.0
+            rec[i] = r
+            eng[i] = e
+            score[i] = 0.38 * trig[i] + 0.30 * r + 0.18 * e + 0.14 * access[i]
+        return score, rec, eng
+else:
+    _score_kernel = _score_kernel_np
+
+def _score_records(records):
+    """Vectorized scoring pass over classified records.
+
+    Fills record["score"] and stashes the trigger/recency/engagement
+    components so enrichment only has to fold in the new accessibility term.
+    """
+    if not records:
+        return
+    now_ts = NOW.timestamp()
+    created = np.array([(r["created_at"].timestamp() if r["created_at"] else 0.0) for r in records])
+    points = np.array([float(r.get("points") or 0) for r in records])
+    comments = np.array([float(r.get("comments") or 0) for r in records])
+    trig = np.array([r["_trig_score"] for r in records])
+    access = np.array([score_accessibility(bool(r["emails_inline"]), bool(r["phones_inline"])) for r in records])
+    score, rec, eng = _score_kernel(created, points, comments, trig, access, now_ts)
+    for r, t, rc, en, s in zip(records, trig, rec, eng, score):
+        r["_scores"] = (float(t), float(rc), float(en))
+        r["score"] = round(float(s), 4)
+
+def trigger_info(hits):
+    """Top trigger label plus trigger score from one walk over the hit set."""
+    per_bucket = defaultdict(int)
+    for bucket, _ in hits.get("trigger", ()):
+        per_bucket[bucket] += 1
     score = 0.0
-    for bucket, kws in TRIGGER_KEYWORDS.items():
-        hits = sum(1 for k in kws if k in t)
-        if hits:
-            weight = {"funding": 1.0, "launch": 0.8, "hiring_freeze": 0.7, "scale_up": 0.6, "deadline": 0.5}.get(bucket, 0.4)
-            score += weight * min(hits, 3)
-    return min(1.0, score / 3.0)
-
-def score_engagement(points=None, comments=None):
-    p = (points or 0)
-    c = (comments or 0)
-    v = math.log1p(p + 0.6 * c)
-    return min(1.0, v / 5.0)
+    for bucket, n in per_bucket.items():
+        score += _TRIGGER_WEIGHTS.get(bucket, 0.4) * min(n, 3)
+    score = min(1.0, score / 3.0)
+    label = None
+    if per_bucket:
+        top = sorted(per_bucket, key=lambda b: _TRIGGER_ORDER.index(b) if b in _TRIGGER_ORDER else 99)[0]
+        label = top.replace("_", " ")
+    return label, score
 
 def score_accessibility(has_email, has_phone):
     base = 0.3 if has_email else 0.0
@@ -174,33 +428,47 @@ def score_accessibility(has_email, has_phone):
         base += 0.4
     return min(1.0, base)
 
-def classify_post(title, text, subreddit=None):
-    s = " ".join([title or "", text or ""]).lower()
+def classify_post(title, text, subreddit=None, hits=None):
+    # Convention tags sit at the title prefix; catch them before paying
+    # for the full keyword scan.
+    tl = (title or "").lower().lstrip()
+    if tl.startswith("[for hire]"):
+        return "Developer Candidate"
+    if tl.startswith("[hiring]"):
+        return "Potential Client"
+    if hits is None:
+        hits = keyword_hits(" ".join([title or "", text or ""]).lower())
+    client_kws = {kw for _, kw in hits.get("client", ())}
+    cand_kws = {kw for _, kw in hits.get("cand", ())}
+    words = {kw for _, kw in hits.get("word", ())}
     if subreddit and subreddit.lower() == "forhire":
-        if "[for hire]" in s:
+        if "[for hire]" in cand_kws:
             return "Developer Candidate"
-        if "[hiring]" in s:
+        if "[hiring]" in client_kws:
             return "Potential Client"
-    client_hits = sum(1 for w in CLIENT_HINTS if w in s)
-    cand_hits = sum(1 for w in CANDIDATE_HINTS if w in s)
-    if cand_hits > client_hits and cand_hits > 0:
+    if len(cand_kws) > len(client_kws) and cand_kws:
         return "Developer Candidate"
-    if client_hits > 0:
+    if client_kws:
         return "Potential Client"
-    if "hire" in s and "developer" in s:
+    if "hire" in words and "developer" in words:
         return "Potential Client"
-    if any(w in s for w in ["available", "for hire"]) and "developer" in s:
+    if ("available" in words or "for hire" in words) and "developer" in words:
         return "Developer Candidate"
     return None
 
 def extract_urls(text):
     if not text: return []
-    regex = r"(https?://[^\s)]+)"
-    return re.findall(regex, text)
+    if _HS_DB is not None:
+        try:
+            return _hs_scan(text)[_HS_URL]
+        except Exception:
+            pass
+    return _URL_RE.findall(text)
 
+@functools.lru_cache(maxsize=8192)
 def extract_domain(url):
     try:
-        ext = tldextract.extract(url)
+        ext = _TLDEXTRACT(url)
         if ext.domain and ext.suffix:
             return f"{ext.domain}.{ext.suffix}"
     except Exception:
@@ -209,78 +477,90 @@ def extract_domain(url):
 
 def html_to_text(s):
     if not s: return ""
+    if HTMLParser is not None:
+        try:
+            node = HTMLParser(s).body
+            if node is not None:
+                return node.text(separator=" ", strip=True)
+        except Exception:
+            pass
     return BeautifulSoup(s, "html.parser").get_text(" ", strip=True)
 
-def guess_industry(text):
-    t = (text or "").lower()
-    patterns = {
-        "Fintech": ["fintech","payments","banking","trading","ledger","crypto","defi"],
-        "Healthtech": ["health","med","clinic","ehr","wellness","fitness"],
-        "E-commerce": ["shopify","ecommerce","storefront","marketplace","checkout"],
-        "SaaS": ["saas","b2b","multi-tenant","subscription"],
-        "Edtech": ["education","learning","edtech","course","lms"],
-        "AI/ML": ["ai","ml","model","llm","computer vision","nlp"],
-        "Logistics": ["logistics","fleet","delivery","supply chain"],
-        "Real Estate": ["real estate","property","proptech"],
-        "Travel": ["travel","booking","itinerary"],
-        "Social": ["social","community","messaging","feed"],
-    }
-    for k, kws in patterns.items():
-        if any(w in t for w in kws):
+def guess_industry(hits):
+    found = {bucket for bucket, _ in hits.get("industry", ())}
+    for k in INDUSTRY_PATTERNS:
+        if k in found:
             return k
     return None
 
-def detect_trigger(text):
-    t = (text or "").lower()
-    hits = []
-    for label, kws in TRIGGER_KEYWORDS.items():
-        if any(k in t for k in kws):
-            hits.append(label.replace("_"," "))
-    order = ["funding","launch","hiring freeze","scale up","deadline"]
-    if hits:
-        hits_sorted = sorted(hits, key=lambda x: order.index(x) if x in order else 99)
-        return hits_sorted[0]
-    return None
-
 def find_emails(text):
     if not text: return []
-    pattern = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
-    return list({e.lower() for e in re.findall(pattern, text)})[:5]
+    if _HS_DB is not None:
+        try:
+            return list({e.lower() for e in _hs_scan(text)[_HS_EMAIL]})[:5]
+        except Exception:
+            pass
+    return list({e.lower() for e in _EMAIL_RE.findall(text)})[:5]
 
 def find_phones(text):
     if not text: return []
-    # Use phonenumbers to parse; also catch tel: links
+    # Clamp hostile UGC and skip digit-free text before matcher work
+    text = text[:200_000]
+    if not any(c.isdigit() for c in text):
+        return []
+    # One PhoneNumberMatcher pass per region over the whole text (covers
+    # tel: links too) instead of parsing every regex candidate 15 times
     candidates = set()
-    for match in re.findall(r"(tel:\+?[0-9()\-\s]{7,20})", text, flags=re.I):
-        candidates.add(match.split(":",1)[1])
-    # Try parsing any digits-rich strings
-    for m in re.findall(r"(\+?[0-9][0-9()\-\s]{6,20}[0-9])", text):
+    for region in _REGIONS:
         try:
-            for country in ["US","IN","GB","CA","AU","SG","DE","NL","FR","ES","SE","NO","DK","IE","AE"]:
-                num = phonenumbers.parse(m, country)
-                if phonenumbers.is_possible_number(num) and phonenumbers.is_valid_number(num):
-                    candidates.add(phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.INTERNATIONAL))
-                    break
+            for m in phonenumbers.PhoneNumberMatcher(text, region):
+                if phonenumbers.is_valid_number(m.number):
+                    candidates.add(phonenumbers.format_number(m.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL))
         except Exception:
             continue
+        if len(candidates) >= 5:
+            break
     return list(candidates)[:5]
 
+# Aggregator/social domains that never identify the poster's company
+_SKIP_DOMAINS = frozenset({
+    "reddit.com", "news.ycombinator.com", "github.com", "gitlab.com",
+    "medium.com", "twitter.com", "x.com", "linkedin.com",
+    "remoteok.com", "techcrunch.com",
+})
+
 def company_from_urls(urls):
-    for u in urls or []:
+    for u in dict.fromkeys(urls or []):
         d = extract_domain(u)
-        if d and not any(x in d for x in ["reddit.com","news.ycombinator.com","github.com","medium.com","twitter.com","linkedin.com","remoteok.com","techcrunch.com"]):
+        if d and d not in _SKIP_DOMAINS:
             base = d.split(".")[0]
             return base.title(), f"https://{d}", d
     return None, None, None
 
+# Per-run response cache: contact pages and company sites repeat across leads
+_PAGE_CACHE = {}
+
+# Cap scraped page bodies; contact info lives in the first screenfuls
+_MAX_PAGE_BYTES = 512 * 1024
+
 def fetch_url(url, timeout=15):
+    with LOCK:
+        if url in _PAGE_CACHE:
+            return _PAGE_CACHE[url]
+    resp = None
     try:
-        r = requests.get(url, headers=REQUEST_HEADERS, timeout=timeout)
-        if r.status_code == 200:
-            return r
+        r = _SESSION.get(url, headers=REQUEST_HEADERS, timeout=timeout, stream=True)
+        ctype = r.headers.get("Content-Type", "")
+        if r.status_code == 200 and (not ctype or "html" in ctype or "text" in ctype or "xml" in ctype):
+            r._content = r.raw.read(_MAX_PAGE_BYTES, decode_content=True)
+            r._content_consumed = True
+            resp = r
+        r.close()
     except Exception:
         pass
-    return None
+    with LOCK:
+        _PAGE_CACHE[url] = resp
+    return resp
 
 def safe_soup(url, timeout=15):
     r = fetch_url(url, timeout=timeout)
@@ -291,8 +571,21 @@ def safe_soup(url, timeout=15):
         return BeautifulSoup(r.text, "html.parser")
 
 def text_from_page(url):
-    soup = safe_soup(url)
-    if not soup: return ""
+    r = fetch_url(url)
+    if not r: return ""
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(r.text)
+            tree.strip_tags(["script","style","noscript"])
+            node = tree.body
+            if node is not None:
+                return node.text(separator=" ", strip=True)
+        except Exception:
+            pass
+    try:
+        soup = BeautifulSoup(r.text, "lxml")
+    except Exception:
+        soup = BeautifulSoup(r.text, "html.parser")
     for t in soup(["script","style","noscript"]): t.extract()
     return soup.get_text(" ", strip=True)
 
@@ -308,21 +601,48 @@ def guess_contact_pages(base_url):
         base_url.rstrip("/") + "/company",
     ]))
 
+def _page_contacts(resp):
+    emails, phones = set(), set()
+    if not resp:
+        return emails, phones
+    text = ""
+    hrefs = []
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(resp.text)
+            hrefs = [n.attributes.get("href") or "" for n in tree.css("a[href]")]
+            node = tree.body
+            text = node.text(separator=" ", strip=True) if node is not None else ""
+        except Exception:
+            hrefs = []
+    if not hrefs and not text:
+        try:
+            soup = BeautifulSoup(resp.text, "lxml")
+        except Exception:
+            soup = BeautifulSoup(resp.text, "html.parser")
+        hrefs = [a["href"] for a in soup.find_all("a", href=True)]
+        text = soup.get_text(" ", strip=True)
+    for href in hrefs:
+        if href.startswith("mailto:"):
+            emails.add(href.split(":",1)[1])
+        if href.lower().startswith("tel:"):
+            phones.add(href.split(":",1)[1])
+    emails.update(find_emails(text))
+    phones.update(find_phones(text))
+    return emails, phones
+
+@functools.lru_cache(maxsize=2048)
 def scrape_emails_phones_from_site(base_url):
+    # Deterministic per site; memoized so leads sharing a company site (and
+    # Streamlit reruns) skip the fetch+parse work, not just the HTTP layer
     found_emails, found_phones = set(), set()
-    for url in guess_contact_pages(base_url):
-        soup = safe_soup(url, timeout=12)
-        if not soup: continue
-        text = soup.get_text(" ", strip=True)
-        for a in soup.find_all("a", href=True):
-            if a["href"].startswith("mailto:"):
-                found_emails.add(a["href"].split(":",1)[1])
-            if a["href"].lower().startswith("tel:"):
-                found_phones.add(a["href"].split(":",1)[1])
-        found_emails.update(find_emails(text))
-        found_phones.update(find_phones(text))
-        if len(found_emails) >= 5 and len(found_phones) >= 5:
-            break
+    urls = guess_contact_pages(base_url)
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        for emails, phones in ex.map(lambda u: _page_contacts(fetch_url(u, timeout=12)), urls):
+            found_emails.update(emails)
+            found_phones.update(phones)
+            if len(found_emails) >= 5 and len(found_phones) >= 5:
+                break
     return list(found_emails)[:5], list(found_phones)[:5]
 
 def shorten(s, n=220):
@@ -331,13 +651,13 @@ def shorten(s, n=220):
     return s if len(s) <= n else s[:n-1].rstrip() + "…"
 
 def dedupe_by_key(items, key_func):
-    seen, out = set(), []
-    for it in items:
-        k = key_func(it)
-        if k and k not in seen:
-            seen.add(k)
-            out.append(it)
-    return out
+    # pandas does the duplicate detection in C; items with falsy keys are
+    # dropped, and the first occurrence wins, as before
+    pairs = [(k, it) for k, it in ((key_func(it), it) for it in items) if k]
+    if not pairs:
+        return []
+    keep = pd.DataFrame({"_key": [k for k, _ in pairs]}).drop_duplicates("_key").index
+    return [pairs[i][1] for i in keep]
 
 # ---------------------------
 # Free-source fetchers
@@ -346,8 +666,8 @@ def dedupe_by_key(items, key_func):
 def fetch_hn_algolia(keywords, max_pages=3):
     url = "https://hn.algolia.com/api/v1/search_by_date"
     query = " OR ".join(f"\"{k}\"" for k in keywords)
-    out = []
-    for page in range(max_pages):
+
+    def fetch_page(page):
         params = {
             "query": query,
             "tags": "story",
@@ -355,14 +675,15 @@ def fetch_hn_algolia(keywords, max_pages=3):
             "hitsPerPage": 100,
             "page": page
         }
+        page_out = []
         try:
-            r = requests.get(url, params=params, headers=REQUEST_HEADERS, timeout=20)
-            if r.status_code != 200: break
-            data = r.json()
+            r = _SESSION.get(url, params=params, headers=REQUEST_HEADERS, timeout=20)
+            if r.status_code != 200: return []
+            data = _json_loads(r)
             for h in data.get("hits", []):
                 created = parse_any_dt(h.get("created_at"))
                 if not within_30_days(created): continue
-                out.append({
+                page_out.append({
                     "source": "Hacker News",
                     "title": h.get("title") or "",
                     "text": "",
@@ -373,25 +694,32 @@ def fetch_hn_algolia(keywords, max_pages=3):
                     "comments": h.get("num_comments") or 0,
                     "subreddit": None,
                 })
-            if not data.get("hits"): break
-            time.sleep(0.25)
         except Exception:
-            break
+            return []
+        return page_out
+
+    # Pages are independent, so fetch them concurrently instead of a
+    # sequential loop with a politeness sleep between pages
+    out = []
+    with ThreadPoolExecutor(max_workers=max_pages) as ex:
+        for page_items in ex.map(fetch_page, range(max_pages)):
+            out.extend(page_items)
     return out
 
 def fetch_reddit_subreddit(subreddit, limit=120):
     url = f"https://www.reddit.com/r/{subreddit}/new.json"
     try:
-        r = requests.get(url, params={"limit": str(limit)}, headers=REQUEST_HEADERS, timeout=20)
+        # raw_json=1 disables Reddit's HTML-entity encoding, so no unescape pass
+        r = _SESSION.get(url, params={"limit": str(limit), "raw_json": 1}, headers=REQUEST_HEADERS, timeout=20)
         if r.status_code != 200: return []
-        data = r.json()
+        data = _json_loads(r)
     except Exception:
         return []
     items = []
     for child in data.get("data", {}).get("children", []):
         d = child.get("data", {})
-        title = html.unescape(d.get("title", "")) or ""
-        selftext = html.unescape(d.get("selftext", "")) or ""
+        title = d.get("title", "") or ""
+        selftext = d.get("selftext", "") or ""
         created = parse_unix_ts(d.get("created_utc"))
         if not within_30_days(created): continue
         items.append({
@@ -409,7 +737,12 @@ def fetch_reddit_subreddit(subreddit, limit=120):
 
 def fetch_rss(url):
     try:
-        feed = feedparser.parse(url)
+        # Stream the body into feedparser's SAX path instead of buffering it
+        with _SESSION.get(url, headers=REQUEST_HEADERS, timeout=20, stream=True) as resp:
+            if resp.status_code != 200:
+                return []
+            resp.raw.decode_content = True
+            feed = feedparser.parse(resp.raw, response_headers=resp.headers)
         out = []
         for e in feed.entries:
             dt = parse_any_dt(getattr(e, "published", None) or getattr(e, "updated", None))
@@ -436,7 +769,21 @@ def fetch_rss(url):
 # Build pipeline
 # ---------------------------
 
+def _records_df(records):
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return pd.DataFrame(columns=["score"])
+    return df.drop(columns=[c for c in df.columns if c.startswith("_")])
+
 def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_workers=12):
+    # The window anchors are module-level so within_30_days stays a single
+    # comparison, but a long-lived server would otherwise keep scoring
+    # against its import-time clock — refresh them once per run.
+    global NOW, EARLIEST_TS
+    NOW = datetime.now(timezone.utc)
+    EARLIEST_TS = NOW - timedelta(days=MAX_DAYS)
+    with LOCK:
+        _PAGE_CACHE.clear()
     all_items = []
 
     # Parallel fetch
@@ -454,35 +801,50 @@ def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_wor
             except Exception:
                 continue
 
+    # Same permalink can surface from several sources; drop repeats before
+    # paying for classification and enrichment. Items without a URL pass.
+    _seen_urls = set()
+    all_items = [it for it in all_items
+                 if not it.get("url") or not (it["url"] in _seen_urls or _seen_urls.add(it["url"]))]
+
+    # User keywords change per run, so they get their own small automaton
+    user_tagged = ([("user_client", None, k) for k in client_kws] +
+                   [("user_cand", None, k) for k in candidate_kws])
+    user_ac = _build_keyword_automaton(user_tagged) if user_tagged else None
+    precheck_tokens = (_CLIENT_TOKEN_SET | _CAND_TOKEN_SET |
+                       {k.lower().split()[0] for k in client_kws + candidate_kws if k.strip()})
+
     # Classify
     potential_clients, developer_candidates = [], []
     for it in all_items:
-        c = classify_post(it["title"], it["text"], subreddit=it.get("subreddit"))
+        it["_blob"] = f"{it['title']} {it['text']}"
+        it["_blob_lower"] = it["_blob"].lower()
+        if precheck_tokens.isdisjoint(_TOKEN_RE.findall(it["_blob_lower"])):
+            continue
+        hits = keyword_hits(it["_blob_lower"])
+        if user_ac is not None:
+            hits.update(keyword_hits(it["_blob_lower"], user_ac))
+        c = classify_post(it["title"], it["text"], subreddit=it.get("subreddit"), hits=hits)
         if not c:
             # Keyword filter pass
-            blob = f"{it['title']} {it['text']}".lower()
-            if any(k.lower() in blob for k in client_kws):
+            if hits.get("user_client"):
                 c = "Potential Client"
-            elif any(k.lower() in blob for k in candidate_kws):
+            elif hits.get("user_cand"):
                 c = "Developer Candidate"
             else:
                 continue
         # Extracts
-        urls = extract_urls(f"{it['title']} {it['text']} {it.get('url','')}")
+        urls = extract_urls(it["_blob"] + " " + (it.get("url") or ""))
         comp_name, comp_site, comp_domain = company_from_urls(urls)
         emails_inline = find_emails(it["text"])
         phones_inline = find_phones(it["text"])
-        trigger = detect_trigger(f"{it['title']} {it['text']}")
-        industry = guess_industry(f"{it['title']} {it['text']}")
-        # Score
-        rec_score = score_recency(it["created_at"])
-        trig_score = score_trigger(f"{it['title']} {it['text']}")
-        eng_score = score_engagement(it.get("points"), it.get("comments"))
-        access_score = score_accessibility(bool(emails_inline), bool(phones_inline))
-        score = round(0.38*trig_score + 0.30*rec_score + 0.18*eng_score + 0.14*access_score, 4)
+        trigger, trig_score = trigger_info(hits)
+        industry = guess_industry(hits)
 
         record = {
             **it,
+            "_kw_hits": hits,
+            "_trig_score": trig_score,
             "urls": urls,
             "company_name_guess": comp_name,
             "company_website_guess": comp_site,
@@ -491,7 +853,6 @@ def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_wor
             "phones_inline": phones_inline,
             "trigger": trigger,
             "industry_guess": industry,
-            "score": score
         }
 
         if c == "Potential Client":
@@ -499,28 +860,62 @@ def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_wor
         else:
             developer_candidates.append(record)
 
-    # Enrich clients: scrape site contact info (free)
-    def enrich_client(doc):
-        site = doc.get("company_website_guess")
-        emails, phones = [], []
+    _score_records(potential_clients)
+    _score_records(developer_candidates)
+
+    # Enrich clients: scrape site contact info (free), once per unique site
+    def enrich_site(site):
         site_title, site_desc = None, None
-        if site:
-            soup = safe_soup(site)
-            if soup:
+        r = fetch_url(site)
+        if r is not None:
+            # Title/meta live in <head>; don't parse the rest of the page
+            html_src = r.text
+            head_end = html_src.find("</head>")
+            if head_end != -1:
+                html_src = html_src[:head_end + len("</head>")]
+            parsed = False
+            if HTMLParser is not None:
+                try:
+                    tree = HTMLParser(html_src)
+                    t = tree.css_first("title")
+                    site_title = t.text(strip=True) if t is not None else None
+                    meta = tree.css_first('meta[name="description"]')
+                    site_desc = (meta.attributes.get("content") or "").strip() if meta is not None else None
+                    parsed = True
+                except Exception:
+                    pass
+            if not parsed:
+                try:
+                    soup = BeautifulSoup(html_src, "lxml")
+                except Exception:
+                    soup = BeautifulSoup(html_src, "html.parser")
                 site_title = soup.title.get_text(strip=True) if soup.title else None
                 meta = soup.find("meta", attrs={"name": "description"})
                 site_desc = meta["content"].strip() if meta and meta.get("content") else None
-            e2, p2 = scrape_emails_phones_from_site(site)
+        e2, p2 = scrape_emails_phones_from_site(site)
+        return site_title, site_desc, e2, p2
+
+    sites = sorted({doc["company_website_guess"] for doc in potential_clients if doc.get("company_website_guess")})
+    site_info = {}
+    if sites:
+        with ThreadPoolExecutor(max_workers=10) as ex:
+            site_info = dict(zip(sites, ex.map(enrich_site, sites)))
+
+    # Stitch site findings back per client; no network in this loop
+    for doc in potential_clients:
+        site = doc.get("company_website_guess")
+        if site:
+            site_title, site_desc, e2, p2 = site_info[site]
             emails = list(dict.fromkeys(doc["emails_inline"] + e2))[:5]
             phones = list(dict.fromkeys(doc["phones_inline"] + p2))[:5]
         else:
+            site_title, site_desc = None, None
             emails, phones = doc["emails_inline"], doc["phones_inline"]
 
-        # Update access score with site finds
+        # Update access score with site finds; other components were stashed
+        # by _score_records, so no text gets re-scored here
         access_score = score_accessibility(bool(emails), bool(phones))
-        rec_score = score_recency(doc["created_at"])
-        trig_score = score_trigger(f"{doc['title']} {doc['text']}")
-        eng_score = score_engagement(doc.get("points"), doc.get("comments"))
+        trig_score, rec_score, eng_score = doc["_scores"]
         new_score = round(0.36*trig_score + 0.28*rec_score + 0.16*eng_score + 0.20*access_score, 4)
 
         doc.update({
@@ -530,23 +925,19 @@ def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_wor
             "phones": phones,
             "score": new_score
         })
-        return doc
-
-    with ThreadPoolExecutor(max_workers=10) as ex:
-        potential_clients = list(ex.map(enrich_client, potential_clients))
 
     # Enrich candidates: skills, availability, YoE, location
     for d in developer_candidates:
-        t = (d["title"] + " " + d["text"]).lower()
-        skills = sorted({s for s in SKILL_LIB if s in t})
-        avail = "Immediate" if any(k in t for k in ["immediate","asap","available now"]) else "Notice Period"
-        m_yoe = re.search(r"(\d{1,2})\+?\s*(?:years|yrs|y)", t)
+        t = d["_blob_lower"]
+        skills = sorted({kw for _, kw in d["_kw_hits"].get("skill", ())})
+        avail = "Immediate" if _AVAIL_RE.search(t) else "Notice Period"
+        m_yoe = _YOE_RE.search(t)
         yoe = int(m_yoe.group(1)) if m_yoe else None
-        m_loc = re.search(r"(remote|india|usa|europe|uk|canada|australia|singapore|germany|netherlands|uae|dubai)", t)
+        m_loc = _LOC_RE.search(t)
         loc = m_loc.group(1).title() if m_loc else "Remote/Unspecified"
         # Try portfolios
         urls = d.get("urls", [])
-        portfolios = [u for u in urls if any(x in u for x in ["github.com","gitlab.com","behance.net","dribbble.com","codepen.io","linkedin.com","portfolio","notion.site"])]
+        portfolios = [u for u in urls if _PORTFOLIO_RE.search(u)]
         d.update({
             "skills": skills[:15],
             "availability": avail,
@@ -559,94 +950,120 @@ def build_from_sources(client_kws, candidate_kws, subreddits, rss_feeds, max_wor
     potential_clients = dedupe_by_key(potential_clients, lambda x: x.get("company_domain_guess") or extract_domain(x.get("url") or "") or x.get("url"))
     developer_candidates = dedupe_by_key(developer_candidates, lambda x: (x.get("author"), x.get("title")))
 
-    # Rank
-    potential_clients.sort(key=lambda x: x["score"], reverse=True)
-    developer_candidates.sort(key=lambda x: x["score"], reverse=True)
-
-    return potential_clients, developer_candidates
+    # Rank and hand back DataFrames; downstream filtering/projection is
+    # column ops instead of per-record Python loops
+    client_df = _records_df(potential_clients)
+    cand_df = _records_df(developer_candidates)
+    # Partial sort: nothing downstream renders more than 100 rows, so a
+    # top-k selection beats a full O(N log N) sort
+    if not client_df.empty:
+        client_df = client_df.nlargest(100, "score").reset_index(drop=True)
+    if not cand_df.empty:
+        cand_df = cand_df.nlargest(100, "score").reset_index(drop=True)
+
+    return client_df, cand_df
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def run_discovery_cached(client_kws, candidate_kws, subreddits, rss_feeds):
+    # Tuple args so Streamlit can hash them; repeat runs with unchanged
+    # inputs are served from cache for 30 minutes
+    return build_from_sources(list(client_kws), list(candidate_kws), list(subreddits), list(rss_feeds))
 
 # ---------------------------
 # Rendering
 # ---------------------------
 
+_CLIENT_MD_TMPL = ("- **{cname}:** {website} | {industry} | Score {score}\n"
+                   "  - **{cname} – Opportunity Summary:** {snippet} (Source: {source})\n"
+                   "  - **Contact:** {contact}\n"
+                   "  - **Trigger Event:** {trig}\n"
+                   "  - **Post:** {title} | {url}\n")
+
+_CAND_MD_TMPL = ("- **{name} – Skills Summary:** {skills}\n"
+                 "  - **Portfolio:** {portfolios}\n"
+                 "  - **Availability:** {availability} | **Experience:** {yoe} | **Location:** {loc}\n"
+                 "  - **Post:** {title} | {url}\n")
+
+def _client_md(c):
+    cname = c.get("company_name_guess") or "(Company TBD)"
+    website = c.get("company_website_guess") or c.get("url")
+    contact_bits = [b for b in [(c.get("emails") or [None])[0], (c.get("phones") or [None])[0]] if b]
+    return _CLIENT_MD_TMPL.format(
+        cname=cname,
+        website=website,
+        industry=c.get("industry_guess") or "Unknown",
+        score=c["score"],
+        snippet=shorten(c.get("text") or c.get("site_desc") or c.get("title"), 280),
+        source=c["source"],
+        contact=" | ".join(contact_bits) if contact_bits else website,
+        trig=c.get("trigger") or "Not specified",
+        title=c["title"],
+        url=c["url"],
+    )
+
+def _cand_md(d):
+    portfolios = d.get("portfolios") or [d.get("url")]
+    return _CAND_MD_TMPL.format(
+        name=(d.get("author") or "Developer") + " (" + (d.get("source") or "") + ")",
+        skills=", ".join(d.get("skills", [])[:10]) or "Skills not specified",
+        portfolios=" | ".join(portfolios[:3]),
+        availability=d.get("availability") or "Notice Period",
+        yoe=f"{int(d['yoe'])} years" if pd.notna(d.get("yoe")) else "N/A",
+        loc=d.get("location_guess") or "Remote/Unspecified",
+        title=d["title"],
+        url=d["url"],
+    )
+
 def render_markdown(clients, candidates, top_n_clients=30, top_n_candidates=30):
-    lines = []
-    lines.append("## Potential Clients")
-    if not clients:
-        lines.append("- No results found in the last 30 days.")
+    # Format only the displayed top-N, one block per row, then a single join
+    parts = ["## Potential Clients"]
+    if clients.empty:
+        parts.append("- No results found in the last 30 days.")
     else:
-        for c in clients[:top_n_clients]:
-            cname = c.get("company_name_guess") or "(Company TBD)"
-            website = c.get("company_website_guess") or c.get("url")
-            industry = c.get("industry_guess") or "Unknown"
-            location = "Unknown"
-            snippet = shorten(c.get("text") or c.get("site_desc") or c.get("title"), 280)
-            contact_bits = []
-            if c.get("emails"):
-                contact_bits.append(c["emails"][0])
-            if c.get("phones"):
-                contact_bits.append(c["phones"][0])
-            contact_line = " | ".join(contact_bits) if contact_bits else website
-            trig = c.get("trigger") or "Not specified"
-            lines.append(f"- **{cname}:** {website} | {industry} | Score {c['score']}")
-            lines.append(f"  - **{cname} – Opportunity Summary:** {snippet} (Source: {c['source']})")
-            lines.append(f"  - **Contact:** {contact_line}")
-            lines.append(f"  - **Trigger Event:** {trig}")
-            lines.append(f"  - **Post:** {c['title']} | {c['url']}")
-            lines.append("")
-    lines.append("## Developer Candidates")
-    if not candidates:
-        lines.append("- No results found in the last 30 days.")
+        parts.extend(clients.head(top_n_clients).apply(_client_md, axis=1).tolist())
+    parts.append("## Developer Candidates")
+    if candidates.empty:
+        parts.append("- No results found in the last 30 days.")
     else:
-        for d in candidates[:top_n_candidates]:
-            name = (d.get("author") or "Developer") + " (" + (d.get("source") or "") + ")"
-            skills = ", ".join(d.get("skills", [])[:10]) or "Skills not specified"
-            portfolios = d.get("portfolios") or [d.get("url")]
-            availability = d.get("availability") or "Notice Period"
-            yoe = f"{d.get('yoe')} years" if d.get("yoe") else "N/A"
-            loc = d.get("location_guess") or "Remote/Unspecified"
-            lines.append(f"- **{name} – Skills Summary:** {skills}")
-            lines.append(f"  - **Portfolio:** " + " | ".join(portfolios[:3]))
-            lines.append(f"  - **Availability:** {availability} | **Experience:** {yoe} | **Location:** {loc}")
-            lines.append(f"  - **Post:** {d['title']} | {d['url']}")
-            lines.append("")
-    return "\n".join(lines)
+        parts.extend(candidates.head(top_n_candidates).apply(_cand_md, axis=1).tolist())
+    return "\n".join(parts)
+
+def _created_iso(series):
+    return series.map(lambda d: d.isoformat() if pd.notna(d) else None)
 
 def to_clients_df(clients):
-    rows = []
-    for c in clients:
-        rows.append({
-            "Company": c.get("company_name_guess"),
-            "Website": c.get("company_website_guess") or c.get("url"),
-            "Industry": c.get("industry_guess"),
-            "Trigger": c.get("trigger"),
-            "Emails": ", ".join(c.get("emails", [])),
-            "Phones": ", ".join(c.get("phones", [])),
-            "Score": c.get("score"),
-            "Source": c.get("source"),
-            "Post Title": c.get("title"),
-            "Post URL": c.get("url"),
-            "Created": c.get("created_at").isoformat() if c.get("created_at") else None,
-        })
-    return pd.DataFrame(rows)
+    if clients.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        "Company": clients["company_name_guess"],
+        "Website": clients["company_website_guess"].fillna(clients["url"]),
+        "Industry": clients["industry_guess"],
+        "Trigger": clients["trigger"],
+        "Emails": clients["emails"].str.join(", "),
+        "Phones": clients["phones"].str.join(", "),
+        "Score": clients["score"],
+        "Source": clients["source"],
+        "Post Title": clients["title"],
+        "Post URL": clients["url"],
+        "Created": _created_iso(clients["created_at"]),
+    })
 
 def to_candidates_df(cands):
-    rows = []
-    for d in cands:
-        rows.append({
-            "Handle": d.get("author"),
-            "Skills": ", ".join(d.get("skills", [])),
-            "Availability": d.get("availability"),
-            "YoE": d.get("yoe"),
-            "Location": d.get("location_guess"),
-            "Portfolios": ", ".join(d.get("portfolios", [])),
-            "Score": d.get("score"),
-            "Source": d.get("source"),
-            "Post Title": d.get("title"),
-            "Post URL": d.get("url"),
-            "Created": d.get("created_at").isoformat() if d.get("created_at") else None,
-        })
-    return pd.DataFrame(rows)
+    if cands.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        "Handle": cands["author"],
+        "Skills": cands["skills"].str.join(", "),
+        "Availability": cands["availability"],
+        "YoE": cands["yoe"],
+        "Location": cands["location_guess"],
+        "Portfolios": cands["portfolios"].str.join(", "),
+        "Score": cands["score"],
+        "Source": cands["source"],
+        "Post Title": cands["title"],
+        "Post URL": cands["url"],
+        "Created": _created_iso(cands["created_at"]),
+    })
 
 # ---------------------------
 # Streamlit UI
@@ -682,18 +1099,22 @@ if run:
         cand_kws = [x.strip() for x in cand_kw.split(",") if x.strip()]
         subs = [x.strip() for x in subreddits.split(",") if x.strip()]
         rss_list = [x.strip() for x in rss_feeds_str.split(",") if x.strip()]
-        clients, candidates = build_from_sources(client_kws, cand_kws, subs, rss_list)
-
-        # Apply filters
-        def pass_filters_client(c):
-            if c["score"]*100 < min_score: return False
-            if industry_filter and (c.get("industry_guess") not in industry_filter): return False
-            if require_contact and not ((c.get("emails") and len(c["emails"])>0) or (c.get("phones") and len(c["phones"])>0)):
-                return False
-            return True
+        clients, candidates = run_discovery_cached(tuple(client_kws), tuple(cand_kws), tuple(subs), tuple(rss_list))
 
-        clients_f = [c for c in clients if pass_filters_client(c)]
-        candidates_f = [d for d in candidates if d["score"]*100 >= min_score]
+        # Apply filters as boolean masks
+        if clients.empty:
+            clients_f = clients
+        else:
+            mask = clients["score"] * 100 >= min_score
+            if industry_filter:
+                mask &= clients["industry_guess"].isin(industry_filter)
+            if require_contact:
+                mask &= (clients["emails"].str.len() > 0) | (clients["phones"].str.len() > 0)
+            clients_f = clients[mask].reset_index(drop=True)
+        if candidates.empty:
+            candidates_f = candidates
+        else:
+            candidates_f = candidates[candidates["score"] * 100 >= min_score].reset_index(drop=True)
 
         md = render_markdown(clients_f, candidates_f, top_n_clients=50, top_n_candidates=50)
 
@@ -721,7 +1142,7 @@ if run:
 
     # Call-ready view
     with st.expander("Call-ready sheets (top 20)"):
-        for c in clients_f[:20]:
+        for c in clients_f.head(20).to_dict("records"):
             cname = c.get("company_name_guess") or "Company"
             website = c.get("company_website_guess") or c.get("url")
             phones = " | ".join(c.get("phones", [])[:2]) or "Phone: N/A"